@@ -98,6 +98,8 @@ class EnvVariable:  # pylint: disable=too-few-public-methods
     DATA_DIR_MODEL_OUTPUT = pathlib.Path(_get_env_variable("DATA_DIR_MODEL_OUTPUT"))
     DATA_DIR_GEOSERVER = pathlib.Path(_get_env_variable("DATA_DIR_GEOSERVER"))
     FLOOD_MODEL_DIR = pathlib.Path(_get_env_variable("FLOOD_MODEL_DIR"))
+    # Optional directory for caching database query results during development, caching is disabled if empty
+    QUERY_CACHE_DIR = _get_env_variable("QUERY_CACHE_DIR", allow_empty=True)
 
     POSTGRES_HOST = _get_env_variable("POSTGRES_HOST", default="localhost")
     POSTGRES_PORT = _get_env_variable("POSTGRES_PORT", default="5431")
@@ -12,11 +12,23 @@ import pandas as pd
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql import text
 
-from src.digitaltwin.tables import GeospatialLayers, UserLogInfo, create_table, check_table_exists, execute_query
+from src.digitaltwin.tables import (
+    GeospatialLayers,
+    UserLogInfo,
+    create_table,
+    check_table_exists,
+    create_spatial_index,
+    drop_spatial_index,
+    execute_query
+)
 from src.digitaltwin.get_data_using_geoapis import fetch_vector_data_using_geoapis
 
 log = logging.getLogger(__name__)
 
+# Polygon layers with many overlapping bounding boxes that are given an SP-GiST index instead of a GiST index, as it is
+# smaller and faster than GiST for their intersection queries
+SPGIST_INDEXED_TABLES = {"region_geometry_clipped"}
+
 
 class NoNonIntersectionError(Exception):
     """Exception raised when no non-intersecting area is found."""
@@ -179,6 +191,13 @@ def nz_geospatial_layers_data_to_db(
             # Insert vector data into the database
             log.info(f"Adding '{table_name}' data ({data_provider} {layer_id}) to the database.")
             vector_data.to_postgis(table_name, engine, index=False, if_exists="replace")
+        # Ensure the layer has a spatial index, used when querying it by location
+        if table_name in SPGIST_INDEXED_TABLES:
+            # Replace the GiST index created by `to_postgis` with the smaller SP-GiST index
+            create_spatial_index(engine, table_name, method="SPGIST")
+            drop_spatial_index(engine, table_name)
+        else:
+            create_spatial_index(engine, table_name)
 
 
 def get_non_intersection_area_from_db(
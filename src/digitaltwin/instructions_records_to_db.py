@@ -18,6 +18,9 @@ from src.digitaltwin.tables import GeospatialLayers, create_table
 
 log = logging.getLogger(__name__)
 
+# Session shared by URL reachability checks, so connections to hosts serving several instruction URLs are reused
+URL_CHECK_SESSION = requests.Session()
+
 
 def validate_url_reachability(section: str, url: str) -> None:
     """
@@ -42,7 +45,7 @@ def validate_url_reachability(section: str, url: str) -> None:
     # Check if the URL is reachable
     try:
         # Send a GET request to the URL
-        response = requests.get(url)
+        response = URL_CHECK_SESSION.get(url)
         # Raise an exception if the response status code indicates an error
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""
+This script provides a parquet-backed cache for the results of expensive database queries, allowing repeated runs
+with unchanged inputs to skip the database entirely during development.
+"""  # noqa: D400
+
+import functools
+import hashlib
+import logging
+import pathlib
+from typing import Callable, TypeVar, Union
+
+import geopandas as gpd
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from src.config import EnvVariable
+
+log = logging.getLogger(__name__)
+
+QueryFunction = TypeVar("QueryFunction", bound=Callable[..., Union[pd.DataFrame, gpd.GeoDataFrame]])
+
+
+def get_cache_dir() -> Union[pathlib.Path, None]:
+    """
+    Get the directory used to cache query results.
+
+    Returns
+    -------
+    Union[pathlib.Path, None]
+        The query cache directory, or None if query caching is disabled (i.e. QUERY_CACHE_DIR is not set).
+    """
+    cache_dir = EnvVariable.QUERY_CACHE_DIR
+    return pathlib.Path(cache_dir) if cache_dir else None
+
+
+def _argument_to_bytes(arg: object) -> bytes:
+    """
+    Get a representation of a query function argument, as bytes, that is stable across runs.
+
+    Parameters
+    ----------
+    arg : object
+        The query function argument.
+
+    Returns
+    -------
+    bytes
+        A representation of the argument, used to generate the cache key.
+    """
+    if isinstance(arg, Engine):
+        # The URL repr masks the password, and identifies the database being queried
+        return repr(arg.url).encode()
+    if isinstance(arg, gpd.GeoDataFrame):
+        # Represent the CRS and the WKB of the geometries along with the other columns
+        return str(arg.crs).encode() + pd.util.hash_pandas_object(arg.to_wkb(hex=True)).values.tobytes()
+    if isinstance(arg, pd.DataFrame):
+        return pd.util.hash_pandas_object(arg).values.tobytes()
+    return repr(arg).encode()
+
+
+def get_cache_key(func: Callable, *args: object, **kwargs: object) -> str:
+    """
+    Generate a cache key for a call to a query function from its name and arguments.
+
+    Parameters
+    ----------
+    func : Callable
+        The query function being called.
+    *args : object
+        Positional arguments passed to the query function.
+    **kwargs : object
+        Keyword arguments passed to the query function.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest uniquely identifying the query function call.
+    """
+    hasher = hashlib.md5(f"{func.__module__}.{func.__qualname__}".encode())
+    for arg in args:
+        hasher.update(_argument_to_bytes(arg))
+    for name, value in sorted(kwargs.items()):
+        hasher.update(name.encode())
+        hasher.update(_argument_to_bytes(value))
+    return hasher.hexdigest()
+
+
+def query_cache(func: QueryFunction) -> QueryFunction:
+    """
+    Cache the DataFrame or GeoDataFrame returned by a database query function as a parquet file, keyed on the
+    function and its arguments. Caching is only enabled when the QUERY_CACHE_DIR environment variable is set,
+    and should only be applied to functions without side effects.
+
+    Parameters
+    ----------
+    func : QueryFunction
+        The query function returning a DataFrame or GeoDataFrame.
+
+    Returns
+    -------
+    QueryFunction
+        The wrapped query function.
+    """  # noqa: D400
+    @functools.wraps(func)
+    def wrapper(*args: object, **kwargs: object) -> Union[pd.DataFrame, gpd.GeoDataFrame]:
+        cache_dir = get_cache_dir()
+        # Run the query directly if caching is disabled
+        if cache_dir is None:
+            return func(*args, **kwargs)
+        cache_key = get_cache_key(func, *args, **kwargs)
+        geo_cache_file = cache_dir / f"{func.__name__}_{cache_key}.geo.parquet"
+        cache_file = cache_dir / f"{func.__name__}_{cache_key}.parquet"
+        # Return the cached query result if it exists
+        if geo_cache_file.exists():
+            log.debug(f"Reading cached result of {func.__name__}() from {geo_cache_file}")
+            return gpd.read_parquet(geo_cache_file)
+        if cache_file.exists():
+            log.debug(f"Reading cached result of {func.__name__}() from {cache_file}")
+            return pd.read_parquet(cache_file)
+        # Otherwise run the query and cache its result
+        query_result = func(*args, **kwargs)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        if isinstance(query_result, gpd.GeoDataFrame):
+            query_result.to_parquet(geo_cache_file)
+        else:
+            query_result.to_parquet(cache_file)
+        log.debug(f"Cached result of {func.__name__}() in {cache_dir}")
+        return query_result
+
+    return wrapper
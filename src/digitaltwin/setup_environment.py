@@ -4,6 +4,7 @@ This script provides functions to set up the database connection using SQLAlchem
 as well as to create an SQLAlchemy engine for database operations.
 """  # noqa: D400
 
+import functools
 import logging
 
 from sqlalchemy import create_engine
@@ -18,9 +19,11 @@ log = logging.getLogger(__name__)
 Base = declarative_base()
 
 
+@functools.lru_cache(maxsize=1)
 def get_database() -> Engine:
     """
     Set up the database connection. Exit the program if connection fails.
+    The engine is created once and shared by subsequent calls, so its connection pool is reused across runs.
 
     Returns
     -------
@@ -83,6 +86,7 @@ def get_engine(host: str, port: str, db: str, username: str, password: str) -> E
         The engine used to connect to the database.
     """
     url = f'postgresql://{username}:{password}@{host}:{port}/{db}'
-    engine = create_engine(url)
+    # Use a connection pool large enough for concurrent callers, checking that pooled connections are still alive
+    engine = create_engine(url, pool_size=10, max_overflow=20, pool_pre_ping=True)
     Base.metadata.create_all(engine)
     return engine
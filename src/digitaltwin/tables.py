@@ -1,15 +1,20 @@
 # -*- coding: utf-8 -*-
 """This script contains SQLAlchemy models for various database tables and utility functions for database operations."""
 
+import csv
 from datetime import datetime, timezone
+from io import StringIO
+from typing import Iterable, List
 
 from geoalchemy2 import Geometry
+from pandas.io.sql import SQLTable
 from sqlalchemy import Boolean, Column, DateTime, inspect, Integer, String
 from sqlalchemy.dialects.postgresql import ARRAY
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import Session, Query
 from sqlalchemy.schema import CheckConstraint, PrimaryKeyConstraint
+from sqlalchemy.sql import text
 
 Base = declarative_base()
 
@@ -231,6 +236,73 @@ def check_table_exists(engine: Engine, table_name: str, schema: str = "public")
     return inspector.has_table(table_name, schema=schema)
 
 
+def get_spatial_index_name(table_name: str, geom_col: str = "geometry", method: str = "GIST") -> str:
+    """
+    Get the name of a spatial index on the geometry column of a table.
+    GiST indexes are named following the GeoAlchemy2 convention, so an index created by `to_postgis` is matched.
+
+    Parameters
+    ----------
+    table_name : str
+        The name of the indexed table.
+    geom_col : str = "geometry"
+        The name of the indexed geometry column. Default is 'geometry'.
+    method : str = "GIST"
+        The index access method, either 'GIST' or 'SPGIST'. Default is 'GIST'.
+
+    Returns
+    -------
+    str
+        The name of the spatial index.
+    """  # noqa: D400
+    if method == "GIST":
+        return f"idx_{table_name}_{geom_col}"
+    return f"idx_{table_name}_{geom_col}_{method.lower()}"
+
+
+def create_spatial_index(engine: Engine, table_name: str, geom_col: str = "geometry", method: str = "GIST") -> None:
+    """
+    Create a spatial index on the geometry column of a table in the database if it doesn't already exist.
+    GiST indexes are named following the GeoAlchemy2 convention, so an index created by `to_postgis` is reused.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    table_name : str
+        The name of the table to index.
+    geom_col : str = "geometry"
+        The name of the geometry column to index. Default is 'geometry'.
+    method : str = "GIST"
+        The index access method, either 'GIST' or 'SPGIST'. Default is 'GIST'.
+    """  # noqa: D400
+    index_name = get_spatial_index_name(table_name, geom_col, method)
+    query = f'CREATE INDEX IF NOT EXISTS "{index_name}" ON "{table_name}" USING {method} ("{geom_col}");'
+    with engine.begin() as conn:
+        conn.execute(text(query))
+
+
+def drop_spatial_index(engine: Engine, table_name: str, geom_col: str = "geometry", method: str = "GIST") -> None:
+    """
+    Drop a spatial index on the geometry column of a table in the database if it exists.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    table_name : str
+        The name of the indexed table.
+    geom_col : str = "geometry"
+        The name of the indexed geometry column. Default is 'geometry'.
+    method : str = "GIST"
+        The index access method, either 'GIST' or 'SPGIST'. Default is 'GIST'.
+    """
+    index_name = get_spatial_index_name(table_name, geom_col, method)
+    query = f'DROP INDEX IF EXISTS "{index_name}";'
+    with engine.begin() as conn:
+        conn.execute(text(query))
+
+
 def execute_query(engine: Engine, query: Query) -> None:
     """
     Execute the given query on the provided engine using a session.
@@ -255,3 +327,31 @@ def execute_query(engine: Engine, query: Query) -> None:
         except Exception as error:
             session.rollback()
             raise error
+
+
+def psql_insert_copy(table: SQLTable, conn: Connection, keys: List[str], data_iter: Iterable) -> None:
+    """
+    Insert data into a PostgreSQL table using COPY, for use as the `method` argument of `pd.DataFrame.to_sql`.
+    Streams all rows in a single COPY statement rather than issuing individual INSERT statements.
+
+    Parameters
+    ----------
+    table : SQLTable
+        The pandas representation of the database table being written to.
+    conn : Connection
+        The SQLAlchemy connection used to write the data.
+    keys : List[str]
+        The column names of the data being inserted.
+    data_iter : Iterable
+        An iterable of rows (tuples of values) to be inserted.
+    """  # noqa: D400
+    # Write the rows to an in-memory CSV buffer
+    csv_buffer = StringIO()
+    csv.writer(csv_buffer).writerows(data_iter)
+    csv_buffer.seek(0)
+    # Construct the fully qualified table name and the quoted column list
+    table_name = f'"{table.schema}"."{table.name}"' if table.schema else f'"{table.name}"'
+    columns = ", ".join(f'"{key}"' for key in keys)
+    # Stream the CSV buffer into the table using the underlying DBAPI (psycopg2) cursor
+    with conn.connection.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table_name} ({columns}) FROM STDIN WITH CSV", csv_buffer)
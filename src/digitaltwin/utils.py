@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 """This script provides utility functions for logging configuration and geospatial data manipulation."""
 
+import functools
 import inspect
 import logging
 import pathlib
@@ -8,7 +9,9 @@ import warnings
 from enum import IntEnum
 
 import geopandas as gpd
+import pandas as pd
 from sqlalchemy.engine import Engine
+from sqlalchemy.sql.elements import TextClause
 
 log = logging.getLogger(__name__)
 
@@ -119,9 +122,38 @@ def get_catchment_area(catchment_area: gpd.GeoDataFrame, to_crs: int = 2193) ->
     gpd.GeoDataFrame
         A GeoDataFrame representing the catchment area with the transformed CRS.
     """
+    # Skip the transformation if the catchment area is already in the specified CRS
+    if catchment_area.crs == to_crs:
+        return catchment_area.copy()
     return catchment_area.to_crs(to_crs)
 
 
+@functools.lru_cache(maxsize=1)
+def _get_nz_boundary_from_db(engine: Engine) -> gpd.GeoDataFrame:
+    """
+    Get the boundary of New Zealand, i.e. the largest part of the union of all regions, computed within the database.
+    The result is cached, as the regions do not change between calls.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        A GeoDataFrame representing the boundary of New Zealand in the CRS of the 'region_geometry' table.
+    """  # noqa: D400
+    # Dissolve and explode the regions, and select the part with the largest area, without transferring every region
+    query = """
+    SELECT parts.geometry
+    FROM (SELECT (ST_Dump(ST_Union(geometry))).geom AS geometry FROM region_geometry) AS parts
+    ORDER BY ST_Area(parts.geometry) DESC
+    LIMIT 1;
+    """
+    return gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
+
+
 def get_nz_boundary(engine: Engine, to_crs: int = 2193) -> gpd.GeoDataFrame:
     """
     Get the boundary of New Zealand in the specified Coordinate Reference System (CRS).
@@ -138,14 +170,40 @@ def get_nz_boundary(engine: Engine, to_crs: int = 2193) -> gpd.GeoDataFrame:
     gpd.GeoDataFrame
         A GeoDataFrame representing the boundary of New Zealand in the specified CRS.
     """
-    # Query the 'region_geometry' table from the database using the provided engine
-    query = "SELECT * FROM region_geometry;"
-    region_geometry = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
-    # Dissolve and explode the geometries to get the boundary of New Zealand
-    nz_boundary = region_geometry.dissolve(aggfunc="sum").explode(index_parts=True).reset_index(level=0, drop=True)
-    # Calculate the area of each geometry and sort them in descending order
-    nz_boundary["geometry_area"] = nz_boundary["geometry"].area
-    nz_boundary = nz_boundary.sort_values(by="geometry_area", ascending=False).head(1)
-    # Convert to the desired coordinate reference system (CRS)
-    nz_boundary = nz_boundary.to_crs(to_crs)
+    # Convert the cached boundary of New Zealand to the desired coordinate reference system (CRS), as a new GeoDataFrame
+    nz_boundary = _get_nz_boundary_from_db(engine).to_crs(to_crs)
     return nz_boundary
+
+
+def read_postgis_in_chunks(
+        engine: Engine,
+        query: TextClause,
+        geom_col: str = "geometry",
+        chunksize: int = 10_000) -> gpd.GeoDataFrame:
+    """
+    Execute a PostGIS query using a server-side cursor and read the result into a GeoDataFrame in chunks,
+    avoiding loading the entire raw result set into client memory at once.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    query : TextClause
+        The query to execute.
+    geom_col : str = "geometry"
+        The name of the geometry column in the query result. Default is 'geometry'.
+    chunksize : int = 10_000
+        The number of rows to retrieve from the server-side cursor per chunk. Default is 10,000.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        A GeoDataFrame containing the query result.
+    """  # noqa: D400
+    with engine.connect() as conn:
+        # Stream the results through a server-side cursor rather than buffering them all on the client
+        streaming_conn = conn.execution_options(stream_results=True, max_row_buffer=chunksize)
+        # Read the query result in chunks and combine them into a single GeoDataFrame
+        chunks = gpd.GeoDataFrame.from_postgis(query, streaming_conn, geom_col=geom_col, chunksize=chunksize)
+        query_result = pd.concat(chunks, ignore_index=True)
+    return query_result
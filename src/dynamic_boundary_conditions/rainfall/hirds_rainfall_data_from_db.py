@@ -2,17 +2,32 @@
 """Retrieve all rainfall data for sites within the catchment area from the database."""
 
 import logging
-from typing import Optional
+from typing import List, Optional
 
 import geopandas as gpd
 import pandas as pd
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql import text
 
+from src.digitaltwin.query_cache import query_cache
 from src.dynamic_boundary_conditions.rainfall import hirds_rainfall_data_to_db
 
 log = logging.getLogger(__name__)
 
+# Statements retrieving the rainfall data for all ARIs and durations for the requested sites from each rainfall data
+# table
+SITES_RAINFALL_QUERIES = {
+    rain_table_name: text(f"""
+    SELECT *
+    FROM {rain_table_name}
+    WHERE site_id = ANY(:site_ids)
+    AND rcp IS NOT DISTINCT FROM :rcp
+    AND time_period IS NOT DISTINCT FROM :time_period
+    ORDER BY array_position(:site_ids, site_id), ari;
+    """)
+    for rain_table_name in hirds_rainfall_data_to_db.RAIN_TABLE.values()
+}
+
 
 def filter_for_duration(rain_data: pd.DataFrame, duration: str) -> pd.DataFrame:
     """
@@ -37,86 +52,107 @@ def filter_for_duration(rain_data: pd.DataFrame, duration: str) -> pd.DataFrame:
     return rain_data
 
 
-def get_one_site_rainfall_data(
+@query_cache
+def get_sites_rainfall_data_all_aris(
         engine: Engine,
-        site_id: str,
+        site_ids: List[str],
         rcp: Optional[float],
         time_period: Optional[str],
-        ari: float,
-        duration: str,
         idf: bool) -> pd.DataFrame:
     """
-    Retrieve rainfall data from the database for the requested site based on the user-requested scenario.
+    Retrieve rainfall data for all ARIs and durations from the database for the requested sites, using a single query
+    for all sites, so that any (ARI, duration) scenario can be selected from the result without querying again.
 
     Parameters
     ----------
     engine : Engine
         The engine used to connect to the database.
-    site_id : str
-        HIRDS rainfall site ID.
+    site_ids : List[str]
+        HIRDS rainfall site IDs.
     rcp : Optional[float]
         Representative Concentration Pathway (RCP) value. Valid options are 2.6, 4.5, 6.0, 8.5, or None
         for historical data.
     time_period : Optional[str]
         Future time period. Valid options are "2031-2050", "2081-2100", or None for historical data.
-    ari : float
-        Average Recurrence Interval (ARI) value. Valid options are 1.58, 2, 5, 10, 20, 30, 40, 50, 60, 80, 100, or 250.
-    duration : str
-        Storm duration. Valid options are: '10m', '20m', '30m', '1h', '2h', '6h', '12h', '24h', '48h', '72h',
-        '96h', '120h', or 'all'.
     idf : bool
         Set to False for rainfall depth data, and True for rainfall intensity data.
 
     Returns
     -------
     pd.DataFrame
-        Rainfall data for the requested site based on the user-requested scenario.
+        Rainfall data for all ARIs and durations for the requested sites, ordered by site as in `site_ids` and then
+        by ARI.
 
     Raises
     ------
     ValueError
         If rcp and time_period arguments are inconsistent.
-    """
+    """  # noqa: D400
     # Get the relevant rainfall data table name from the idf parameter
-    rain_table_name = hirds_rainfall_data_to_db.db_rain_table_name(idf)
-    log.info(f"Retrieving the requested '{rain_table_name}' scenario data for site {site_id} from the database.")
+    rain_table_name = hirds_rainfall_data_to_db.RAIN_TABLE[idf]
+    log.info(f"Retrieving the requested '{rain_table_name}' scenario data for sites {site_ids} from the database.")
     # Check for inconsistent rcp and time_period arguments
     if (rcp is None and time_period is not None) or (rcp is not None and time_period is None):
         raise ValueError("Inconsistent arguments provided. "
                          "For historical data, both 'rcp' and 'time_period' should be None. "
                          "If 'rcp' is None, 'time_period' should also be None, and vice versa.")
-    elif rcp is not None and time_period is not None:
-        # Query for specific rcp and time_period
-        command_text = f"""
-        SELECT *
-        FROM {rain_table_name}
-        WHERE site_id=:site_id AND rcp=:rcp AND time_period=:time_period AND ari=:ari
-        """
-        query = text(command_text).bindparams(
-            site_id=site_id,
-            rcp=rcp,
-            time_period=time_period,
-            ari=ari
-        )
-        rain_data = pd.read_sql_query(query, engine)
-
-    else:
-        # Query for historical data (rcp is None and time_period is None)
-        command_text = f"""
-        SELECT *
-        FROM {rain_table_name}
-        WHERE site_id=:site_id AND rcp IS NULL AND time_period IS NULL AND ari=:ari
-        """
-        query = text(command_text).bindparams(
-            site_id=site_id,
-            ari=ari
-        )
-        rain_data = pd.read_sql_query(query, engine)
+    # Query for all requested sites at once, matching NULL rcp and time_period for historical data
+    query = SITES_RAINFALL_QUERIES[rain_table_name].bindparams(
+        site_ids=site_ids,
+        rcp=rcp,
+        time_period=time_period
+    )
+    with engine.connect() as conn:
+        rain_data = pd.read_sql_query(query, conn)
+    if rcp is None:
         # Filter for historical data
         rain_data.query("category == 'hist'", inplace=True)
+    return rain_data.reset_index(drop=True)
+
+
+def get_sites_rainfall_data(
+        engine: Engine,
+        site_ids: List[str],
+        rcp: Optional[float],
+        time_period: Optional[str],
+        ari: float,
+        duration: str,
+        idf: bool) -> pd.DataFrame:
+    """
+    Retrieve rainfall data from the database for the requested sites based on the user-requested scenario,
+    selecting the requested ARI and duration from the rainfall data for all ARIs and durations.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    site_ids : List[str]
+        HIRDS rainfall site IDs.
+    rcp : Optional[float]
+        Representative Concentration Pathway (RCP) value. Valid options are 2.6, 4.5, 6.0, 8.5, or None
+        for historical data.
+    time_period : Optional[str]
+        Future time period. Valid options are "2031-2050", "2081-2100", or None for historical data.
+    ari : float
+        Average Recurrence Interval (ARI) value. Valid options are 1.58, 2, 5, 10, 20, 30, 40, 50, 60, 80, 100, or 250.
+    duration : str
+        Storm duration. Valid options are: '10m', '20m', '30m', '1h', '2h', '6h', '12h', '24h', '48h', '72h',
+        '96h', '120h', or 'all'.
+    idf : bool
+        Set to False for rainfall depth data, and True for rainfall intensity data.
+
+    Returns
+    -------
+    pd.DataFrame
+        Rainfall data for the requested sites based on the user-requested scenario, ordered as in `site_ids`.
+    """  # noqa: D400
+    # Get the rainfall data for all ARIs and durations for the requested sites
+    rain_data_all_aris = get_sites_rainfall_data_all_aris(engine, site_ids, rcp, time_period, idf)
+    # Select the rainfall data for the requested ARI
+    rain_data = rain_data_all_aris[rain_data_all_aris["ari"] == ari]
     # Filter for duration
     rain_data = filter_for_duration(rain_data, duration)
-    return rain_data
+    return rain_data.reset_index(drop=True)
 
 
 def rainfall_data_from_db(
@@ -157,12 +193,7 @@ def rainfall_data_from_db(
     """
     # Get the site IDs within the catchment area
     site_ids_in_catchment = hirds_rainfall_data_to_db.get_site_ids_in_catchment(sites_in_catchment)
-    # Initialize an empty DataFrame to store the rainfall data
-    rain_data_in_catchment = pd.DataFrame()
-    # Iterate over each site ID in the catchment area
-    for site_id in site_ids_in_catchment:
-        # Retrieve the rainfall data for the site
-        rain_data = get_one_site_rainfall_data(engine, site_id, rcp, time_period, ari, duration, idf)
-        # Concatenate the site's rainfall data to the overall catchment data
-        rain_data_in_catchment = pd.concat([rain_data_in_catchment, rain_data], ignore_index=True)
+    # Retrieve the rainfall data for all sites within the catchment area in a single query
+    rain_data_in_catchment = get_sites_rainfall_data(
+        engine, site_ids_in_catchment, rcp, time_period, ari, duration, idf)
     return rain_data_in_catchment
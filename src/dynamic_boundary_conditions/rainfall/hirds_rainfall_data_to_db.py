@@ -2,35 +2,58 @@
 """Store the rainfall data for all the sites within the catchment area in the database."""
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 import pandas as pd
 import geopandas as gpd
-from sqlalchemy.engine import Engine
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.sql import text
 
 from src.digitaltwin import tables
 from src.dynamic_boundary_conditions.rainfall import rainfall_data_from_hirds
 
 log = logging.getLogger(__name__)
 
-
-def db_rain_table_name(idf: bool) -> str:
-    """
-    Return the relevant rainfall data table name used in the database.
-
-    Parameters
-    ----------
-    idf : bool
-        Set to False for rainfall depth data, and True for rainfall intensity data.
-
-    Returns
-    -------
-    str
-        The relevant rainfall data table name.
-    """
-    # Determine the table name based on the idf parameter
-    table_name = "rainfall_depth" if idf is False else "rainfall_intensity"
-    return table_name
+# Maximum number of concurrent requests made to the HIRDS website, kept low to avoid being throttled
+HIRDS_MAX_WORKERS = 8
+# Rainfall data table names used in the database, keyed by the idf parameter, i.e. False for rainfall depth data and
+# True for rainfall intensity data
+RAIN_TABLE = {False: "rainfall_depth", True: "rainfall_intensity"}
+# Storm durations for which HIRDS provides rainfall depth and intensity data
+HIRDS_DURATIONS = ["10m", "20m", "30m", "1h", "2h", "6h", "12h", "24h", "48h", "72h", "96h", "120h"]
+
+# Statements creating each rainfall data table, with a rainfall depth or intensity column for each storm duration,
+# and the index on its site IDs
+RAIN_TABLE_DDL = {
+    rain_table_name: text(f"""
+    CREATE TABLE IF NOT EXISTS {rain_table_name} (
+        site_id TEXT,
+        category TEXT,
+        rcp DOUBLE PRECISION,
+        time_period TEXT,
+        ari DOUBLE PRECISION,
+        aep DOUBLE PRECISION,
+        {", ".join(f'"{duration}" DOUBLE PRECISION' for duration in HIRDS_DURATIONS)}
+    );
+    CREATE INDEX IF NOT EXISTS "idx_{rain_table_name}_site_id" ON {rain_table_name} (site_id);
+    """)
+    for rain_table_name in RAIN_TABLE.values()
+}
+# Queries finding the catchment site IDs that are not present in each rainfall data table, so that only the catchment
+# sites are checked rather than retrieving every site ID in the table
+SITE_IDS_NOT_IN_DB_QUERIES = {
+    rain_table_name: text(f"""
+    SELECT catchment.site_id
+    FROM unnest(CAST(:site_ids AS text[])) AS catchment(site_id)
+    WHERE NOT EXISTS (
+        SELECT 1
+        FROM {rain_table_name} AS rain
+        WHERE rain.site_id = catchment.site_id
+    );
+    """)
+    for rain_table_name in RAIN_TABLE.values()
+}
 
 
 def get_site_ids_in_catchment(sites_in_catchment: gpd.GeoDataFrame) -> List[str]:
@@ -52,14 +75,14 @@ def get_site_ids_in_catchment(sites_in_catchment: gpd.GeoDataFrame) -> List[str]
     return site_ids_in_catchment
 
 
-def get_site_ids_not_in_db(engine: Engine, site_ids_in_catchment: List[str], idf: bool) -> List[str]:
+def get_site_ids_not_in_db(conn: Connection, site_ids_in_catchment: List[str], idf: bool) -> List[str]:
     """
     Get the list of rainfall site IDs that are within the catchment area but not in the database.
 
     Parameters
     ----------
-    engine : Engine
-        The engine used to connect to the database.
+    conn : Connection
+        The connection used to query the database.
     site_ids_in_catchment : List[str]
         Rainfall site IDs within the catchment area.
     idf : bool
@@ -70,52 +93,48 @@ def get_site_ids_not_in_db(engine: Engine, site_ids_in_catchment: List[str], idf
     List[str]
         The rainfall site IDs within the catchment area but not present in the database.
     """
-    # Get the relevant rainfall data table name from the idf parameter
-    rain_table_name = db_rain_table_name(idf)
-    # Construct the query to retrieve the distinct site IDs from the rainfall data table
-    query = f"SELECT DISTINCT site_id FROM {rain_table_name};"
-    # Execute the query and retrieve the site IDs in the database as a DataFrame
-    site_ids_in_db = pd.read_sql_query(query, engine)
-    # Convert the DataFrame to a list of site IDs in the database
-    site_ids_in_db = site_ids_in_db["site_id"].tolist()
-    # Find the site IDs in site_ids_in_catchment that are not present in site_ids_in_db
-    site_ids_not_in_db = list(set(site_ids_in_catchment).difference(site_ids_in_db))
+    # Get the query for the relevant rainfall data table from the idf parameter
+    query = SITE_IDS_NOT_IN_DB_QUERIES[RAIN_TABLE[idf]].bindparams(site_ids=site_ids_in_catchment)
+    # Execute the query and retrieve the site IDs not in the database directly as a list
+    site_ids_not_in_db = conn.execute(query).scalars().all()
     return site_ids_not_in_db
 
 
-def add_rainfall_data_to_db(engine: Engine, site_id: str, idf: bool) -> None:
+def fetch_site_rainfall_data(site_id: str, idf: bool) -> pd.DataFrame:
     """
-    Store the rainfall data for a specific site in the database.
+    Fetch the rainfall data for a specific site from the HIRDS website and convert it to a tabular format.
 
     Parameters
     ----------
-    engine : Engine
-        The engine used to connect to the database.
     site_id : str
         HIRDS rainfall site ID.
     idf : bool
         Set to False for rainfall depth data, and True for rainfall intensity data.
+
+    Returns
+    -------
+    pd.DataFrame
+        Rainfall data for the requested site in tabular format, covering all block structures.
     """
     # Get the relevant rainfall data table name from the idf parameter
-    rain_table_name = db_rain_table_name(idf)
+    rain_table_name = RAIN_TABLE[idf]
     # Retrieve the rainfall data for the specified site from HIRDS
     log.info(f"Fetching '{rain_table_name}' data for site {site_id} from the HIRDS website https://hirds.niwa.co.nz/.")
     site_data = rainfall_data_from_hirds.get_data_from_hirds(site_id, idf)
     # Extract the layout structure of the data
     layout_structure = rainfall_data_from_hirds.get_layout_structure_of_data(site_data)
-
-    log.info(f"Adding '{rain_table_name}' data for site {site_id} to the database.")
-    # Iterate over each block structure in the layout structure
-    for block_structure in layout_structure:
-        # Convert the data to a tabular format
-        rain_data = rainfall_data_from_hirds.convert_to_tabular_data(site_data, site_id, block_structure)
-        # Store the tabular data in the relevant rainfall data table in the database
-        rain_data.to_sql(rain_table_name, engine, index=False, if_exists="append")
+    # Convert the data of each block structure in the layout structure to a tabular format and combine them
+    rain_data = pd.concat(
+        [rainfall_data_from_hirds.convert_to_tabular_data(site_data, site_id, block_structure)
+         for block_structure in layout_structure],
+        ignore_index=True)
+    return rain_data
 
 
 def add_each_site_rainfall_data(engine: Engine, site_ids_list: List[str], idf: bool) -> None:
     """
     Add rainfall data for each site in the site_ids_list to the database.
+    The data is fetched from HIRDS concurrently and then written to the database within a single transaction.
 
     Parameters
     ----------
@@ -125,9 +144,32 @@ def add_each_site_rainfall_data(engine: Engine, site_ids_list: List[str], idf: b
         List of rainfall sites' IDs.
     idf : bool
         Set to False for rainfall depth data, and True for rainfall intensity data.
+    """  # noqa: D400
+    # Get the relevant rainfall data table name from the idf parameter
+    rain_table_name = RAIN_TABLE[idf]
+    # Fetch the rainfall data for all sites concurrently, as each request is dominated by HIRDS response latency
+    with ThreadPoolExecutor(max_workers=HIRDS_MAX_WORKERS) as executor:
+        sites_rain_data = list(executor.map(lambda site_id: fetch_site_rainfall_data(site_id, idf), site_ids_list))
+    log.info(f"Adding '{rain_table_name}' data for sites {site_ids_list} to the database.")
+    # Combine the rainfall data of all sites
+    rain_data = pd.concat(sites_rain_data, ignore_index=True)
+    # Store the tabular data in the relevant rainfall data table using a single bulk COPY and transaction
+    with engine.begin() as conn:
+        rain_data.to_sql(rain_table_name, conn, index=False, if_exists="append", method=tables.psql_insert_copy)
+
+
+def ensure_rain_table(conn: Connection, table_name: str) -> None:
+    """
+    Create the rainfall data table, and the index on its site IDs, in the database if they don't already exist.
+
+    Parameters
+    ----------
+    conn : Connection
+        The connection used to execute the statements, within the caller's transaction.
+    table_name : str
+        The name of the rainfall data table.
     """
-    for site_id in site_ids_list:
-        add_rainfall_data_to_db(engine, site_id, idf)
+    conn.execute(RAIN_TABLE_DDL[table_name])
 
 
 def rainfall_data_to_db(engine: Engine, sites_in_catchment: gpd.GeoDataFrame, idf: bool = False) -> None:
@@ -146,21 +188,20 @@ def rainfall_data_to_db(engine: Engine, sites_in_catchment: gpd.GeoDataFrame, id
     # Get the IDs of the sites within the catchment area
     site_ids_in_catchment = get_site_ids_in_catchment(sites_in_catchment)
     # Determine the table name based on idf
-    table_name = db_rain_table_name(idf)
-    # Check if the table already exists in the database
-    if tables.check_table_exists(engine, table_name):
+    table_name = RAIN_TABLE[idf]
+    # Check if there are sites within the catchment area
+    if not site_ids_in_catchment:
+        log.info("No rainfall sites found within the requested catchment area.")
+        return
+    # Prepare the table and look up the missing sites using a single pooled connection and transaction
+    with engine.begin() as conn:
+        # Create the rainfall data table if it doesn't exist, so that it can always be appended to
+        ensure_rain_table(conn, table_name)
         # Get the IDs of sites not in the database
-        site_ids_not_in_db = get_site_ids_not_in_db(engine, site_ids_in_catchment, idf)
-        # Check if there are sites not in the database
-        if site_ids_not_in_db:
-            # Add rainfall data for sites not in the database
-            add_each_site_rainfall_data(engine, site_ids_not_in_db, idf)
-        else:
-            log.info(f"'{table_name}' data for sites within the requested catchment area is already in the database.")
+        site_ids_not_in_db = get_site_ids_not_in_db(conn, site_ids_in_catchment, idf)
+    # Check if there are sites not in the database
+    if site_ids_not_in_db:
+        # Add rainfall data for sites not in the database
+        add_each_site_rainfall_data(engine, site_ids_not_in_db, idf)
     else:
-        # Check if there are sites within the catchment area
-        if site_ids_in_catchment:
-            # Add rainfall data for all sites within the catchment area
-            add_each_site_rainfall_data(engine, site_ids_in_catchment, idf)
-        else:
-            log.info("No rainfall sites found within the requested catchment area.")
+        log.info(f"'{table_name}' data for sites within the requested catchment area is already in the database.")
@@ -13,6 +13,7 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.sql import text
 
 from src.digitaltwin import tables
+from src.digitaltwin.query_cache import query_cache
 from src.digitaltwin.utils import get_nz_boundary
 
 log = logging.getLogger(__name__)
@@ -128,6 +129,7 @@ def thiessen_polygons_to_db(engine: Engine) -> None:
         rainfall_sites_voronoi.to_postgis(f"{table_name}", engine, if_exists="replace")
 
 
+@query_cache
 def thiessen_polygons_from_db(engine: Engine, catchment_area: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Get rainfall sites coverage areas (Thiessen polygons) that intersect or are within the catchment area.
@@ -3,6 +3,7 @@
 
 import asyncio
 import logging
+from io import BytesIO
 from typing import List, Dict, Union, NamedTuple
 
 import aiohttp
@@ -238,10 +239,15 @@ def fetch_rec_data_from_niwa(engine: Engine, url: str = REC_API_URL) -> gpd.GeoD
         raise RuntimeError("Failed to fetch 'rec_data' from NIWA using the ArcGIS REST API.") from e
 
 
-def fetch_backup_rec_data_from_niwa() -> gpd.GeoDataFrame:
+def fetch_backup_rec_data_from_niwa(engine: Engine) -> gpd.GeoDataFrame:
     """
     Retrieve REC data in New Zealand from NIWA OpenData.
 
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+
     Returns
     -------
     gpd.GeoDataFrame
@@ -261,10 +267,12 @@ def fetch_backup_rec_data_from_niwa() -> gpd.GeoDataFrame:
     response = requests.get(url)
     # Check if the request was successful (status code 200)
     if response.status_code == 200:
-        # Parse the JSON response
-        geojson_data = response.json()
-        # Convert GeoJSON data to GeoDataFrame
-        rec_data = gpd.GeoDataFrame.from_features(geojson_data['features'])
+        # Get the New Zealand boundary, used to filter the REC data in the same way as the ArcGIS REST API queries
+        nz_boundary = get_nz_boundary(engine, to_crs=2193)
+        # Read the GeoJSON response, letting GDAL skip features outside the bounding box of the New Zealand boundary
+        rec_data = gpd.read_file(BytesIO(response.content), bbox=nz_boundary)
+        # Convert to the same CRS as the REC data retrieved using the ArcGIS REST API
+        rec_data = rec_data.to_crs(2193)
         # Ensure consistent column naming convention by converting all column names to lowercase
         rec_data.columns = rec_data.columns.str.lower()
         # Move the 'geometry' column to the end, ensuring spatial columns are located at the end of database tables
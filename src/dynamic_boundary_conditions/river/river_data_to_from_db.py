@@ -7,16 +7,73 @@ information from the database.
 import logging
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
+from geoalchemy2 import Geometry
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql import text
 
-from src.digitaltwin.tables import check_table_exists
+from src.digitaltwin.query_cache import query_cache
+from src.digitaltwin.tables import check_table_exists, create_spatial_index, psql_insert_copy
+from src.digitaltwin.utils import read_postgis_in_chunks
 from src.dynamic_boundary_conditions.river import river_data_from_niwa
 from src.dynamic_boundary_conditions.river.river_network_to_from_db import add_network_exclusions_to_db
 
 log = logging.getLogger(__name__)
 
+# Query to retrieve REC data that intersects with the union of the sea-draining catchments and the catchment area,
+# and to determine the sea-draining catchment that each REC geometry is within, computed within the database.
+REC_JOIN_SDC_QUERY = text("""
+    WITH sdc AS (
+        SELECT sdc.catch_id, sdc.geometry
+        FROM sea_draining_catchments AS sdc
+        WHERE ST_Intersects(sdc.geometry, ST_GeomFromWKB(:catchment_polygon, 2193))
+    ),
+    combined AS (
+        SELECT ST_Union(parts.geometry) AS geometry
+        FROM (
+            SELECT sdc.geometry FROM sdc
+            UNION ALL
+            SELECT ST_GeomFromWKB(:catchment_polygon, 2193)
+        ) AS parts
+    )
+    SELECT rec.*, sdc.catch_id
+    FROM rec_data AS rec
+    JOIN combined ON ST_Intersects(rec.geometry, combined.geometry)
+    LEFT JOIN sdc ON ST_Within(rec.geometry, sdc.geometry);
+    """)
+
+
+def copy_rec_data_to_db(engine: Engine, rec_data: gpd.GeoDataFrame, table_name: str) -> None:
+    """
+    Bulk load REC data into a new database table using a single COPY, without a spatial index, so that the index can
+    be built once the data has been loaded rather than maintained row by row during the load.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    rec_data : gpd.GeoDataFrame
+        A GeoDataFrame containing the REC data.
+    table_name : str
+        The name of the database table to store the REC data in.
+    """  # noqa: D400
+    # Get the SRID of the REC data
+    srid = rec_data.crs.to_epsg()
+    # Convert the geometries to hex-encoded EWKB, which PostGIS parses directly when copied into a geometry column
+    geometries = shapely.set_srid(np.asarray(rec_data.geometry), srid)
+    rec_data_ewkb = pd.DataFrame(rec_data).assign(geometry=shapely.to_wkb(geometries, hex=True, include_srid=True))
+    # Create the table with a geometry column, without a spatial index, and COPY the REC data into it
+    geometry_type = Geometry(geometry_type="GEOMETRY", srid=srid, spatial_index=False)
+    with engine.begin() as conn:
+        rec_data_ewkb.to_sql(
+            table_name, conn, index=False, if_exists="replace", dtype={"geometry": geometry_type},
+            method=psql_insert_copy)
+        # Collect planner statistics for the freshly loaded table, rather than waiting for autovacuum to analyse it,
+        # so that the first queries against it are planned with accurate row counts and geometry statistics
+        conn.execute(text(f'ANALYZE "{table_name}";'))
+
 
 def store_rec_data_to_db(engine: Engine) -> None:
     """
@@ -40,16 +97,22 @@ def store_rec_data_to_db(engine: Engine) -> None:
             # Log a warning message to indicate that a runtime error occurred while fetching REC data
             log.warning(error)
             # Retrieve backup REC data from NIWA OpenData
-            rec_data = river_data_from_niwa.fetch_backup_rec_data_from_niwa()
+            rec_data = river_data_from_niwa.fetch_backup_rec_data_from_niwa(engine)
         # Store the REC data to the database table
         log.info(f"Adding '{table_name}' to the database.")
-        rec_data.to_postgis(table_name, engine, index=False, if_exists="replace")
+        copy_rec_data_to_db(engine, rec_data, table_name)
         log.info(f"Successfully added '{table_name}' to the database.")
+    # Ensure both the REC data and the sea-draining catchments have a spatial index, used when joining them
+    for spatial_table_name in (table_name, "sea_draining_catchments"):
+        if check_table_exists(engine, spatial_table_name):
+            create_spatial_index(engine, spatial_table_name)
 
 
-def get_sdc_data_from_db(engine: Engine, catchment_area: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+@query_cache
+def get_rec_data_join_sdc_from_db(engine: Engine, catchment_area: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
-    Retrieve sea-draining catchment data from the database that intersects with the given catchment area.
+    Retrieve REC data from the database for the specified catchment area, joined with the sea-draining catchment
+    that each REC geometry is fully contained within.
 
     Parameters
     ----------
@@ -61,22 +124,18 @@ def get_sdc_data_from_db(engine: Engine, catchment_area: gpd.GeoDataFrame) -> gp
     Returns
     -------
     gpd.GeoDataFrame
-        A GeoDataFrame containing sea-draining catchment data that intersects with the given catchment area.
-    """
+        A GeoDataFrame containing the retrieved REC data for the specified catchment area with a 'catch_id' column
+        identifying the associated sea-draining catchment, which is missing for REC geometries that are not fully
+        contained within a sea-draining catchment.
+    """  # noqa: D400
     # Extract the geometry of the catchment area
     catchment_polygon = catchment_area["geometry"][0]
-    # Query to retrieve sea-draining catchments that intersect with the catchment polygon
-    command_text = """
-    SELECT *
-    FROM sea_draining_catchments AS sdc
-    WHERE ST_Intersects(sdc.geometry, ST_GeomFromText(:catchment_polygon, 2193));
-    """
-    sea_drain_query = text(command_text).bindparams(
-        catchment_polygon=str(catchment_polygon)
+    rec_query = REC_JOIN_SDC_QUERY.bindparams(
+        catchment_polygon=catchment_polygon.wkb
     )
-    # Execute the query and create a GeoDataFrame from the result
-    sdc_data = gpd.GeoDataFrame.from_postgis(sea_drain_query, engine, geom_col="geometry")
-    return sdc_data
+    # Execute the query and retrieve the REC data joined with the sea-draining catchments from the database
+    rec_data_join_sdc = read_postgis_in_chunks(engine, rec_query, geom_col="geometry")
+    return rec_data_join_sdc
 
 
 def get_rec_data_with_sdc_from_db(
@@ -104,30 +163,8 @@ def get_rec_data_with_sdc_from_db(
         A GeoDataFrame containing the retrieved REC data for the specified catchment area with an additional column
         that identifies the associated sea-draining catchment for each REC geometry.
     """  # noqa: D400
-    # Get sea-draining catchment data from the database
-    sdc_data = get_sdc_data_from_db(engine, catchment_area)
-    # Unify the sea-draining catchment polygons into a single polygon
-    sdc_polygon = sdc_data.unary_union
-    # Create a GeoDataFrame representing the unified sea-draining catchment area
-    sdc_area = gpd.GeoDataFrame(geometry=[sdc_polygon], crs=sdc_data.crs)
-    # Combine the sea-draining catchment area with the input catchment area to create a final unified polygon
-    combined_polygon = pd.concat([sdc_area, catchment_area]).unary_union
-    # Query to retrieve REC data that intersects with the combined polygon
-    command_text = """
-    SELECT *
-    FROM rec_data AS rec
-    WHERE ST_Intersects(rec.geometry, ST_GeomFromText(:combined_polygon, 2193));
-    """
-    rec_query = text(command_text).bindparams(
-        combined_polygon=str(combined_polygon)
-    )
-    # Execute the query and retrieve the REC data from the database
-    rec_data = gpd.GeoDataFrame.from_postgis(rec_query, engine, geom_col="geometry")
-    # Determine the sea-draining catchment for each REC geometry (using the 'within' predicate)
-    rec_data_join_sdc = (
-        gpd.sjoin(rec_data, sdc_data[["catch_id", "geometry"]], how="left", predicate="within")
-        .drop(columns=["index_right"])
-    )
+    # Get the REC data for the catchment area joined with the associated sea-draining catchments
+    rec_data_join_sdc = get_rec_data_join_sdc_from_db(engine, catchment_area)
     # Get rows where REC geometries are fully contained within sea-draining catchments
     rec_data_with_sdc = rec_data_join_sdc[~rec_data_join_sdc["catch_id"].isna()]
     # Remove any duplicate records and sort by the 'objectid' column
@@ -115,7 +115,7 @@ def get_new_network_output_paths() -> Tuple[pathlib.Path, pathlib.Path]:
     # Create the file path for the REC Network with the current timestamp
     network_path = network_dir / f"{dt_string}_network.pickle"
     # Create the file path for the REC Network data with the current timestamp
-    network_data_path = network_dir / f"{dt_string}_network_data.geojson"
+    network_data_path = network_dir / f"{dt_string}_network_data.parquet"
     return network_path, network_data_path
 
 
@@ -180,12 +180,9 @@ def store_rec_network_to_db(
     with open(network_path, "wb") as file:
         pickle.dump(rec_network, file)
 
-    # Convert the 'first_coord' and 'last_coord' columns to string format to facilitate exporting
-    network_data = rec_network_data.copy()
-    network_data["first_coord"] = network_data["first_coord"].astype(str)
-    network_data["last_coord"] = network_data["last_coord"].astype(str)
-    # Save the REC river network data to the specified file
-    network_data.to_file(str(network_data_path), driver="GeoJSON")
+    # Save the REC river network data to the specified file as GeoParquet, which stores the 'first_coord' and
+    # 'last_coord' geometry columns natively as WKB, avoiding a WKT round-trip
+    rec_network_data.to_parquet(network_data_path)
 
     # Create the REC Network table in the database if it doesn't exist
     create_table(engine, RiverNetwork)
@@ -204,6 +201,32 @@ def store_rec_network_to_db(
     log.info("Successfully added the REC river network metadata to the database.")
 
 
+def read_network_data(network_data_path: str) -> gpd.GeoDataFrame:
+    """
+    Read the REC river network data from a GeoParquet file, or from a GeoJSON file for networks stored before
+    GeoParquet was used.
+
+    Parameters
+    ----------
+    network_data_path : str
+        The path to the REC Network data file.
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        A GeoDataFrame containing the REC river network data.
+    """  # noqa: D400
+    # GeoParquet files retain the data types of the 'first_coord' and 'last_coord' geometry columns
+    if pathlib.Path(network_data_path).suffix == ".parquet":
+        return gpd.read_parquet(network_data_path)
+    # Otherwise read the legacy GeoJSON file
+    rec_network_data = gpd.read_file(network_data_path)
+    # Set the data type of the 'first_coord' and 'last_coord' columns to geometry
+    rec_network_data["first_coord"] = rec_network_data["first_coord"].apply(shapely.wkt.loads).astype("geometry")
+    rec_network_data["last_coord"] = rec_network_data["last_coord"].apply(shapely.wkt.loads).astype("geometry")
+    return rec_network_data
+
+
 def get_existing_network_metadata_from_db(engine: Engine, catchment_area: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
     """
     Retrieve existing REC river network metadata for the specified catchment area from the database.
@@ -286,10 +309,7 @@ def get_existing_network(engine: Engine, existing_network_meta: gpd.GeoDataFrame
     with open(existing_network_series["network_path"], "rb") as file:
         rec_network = pickle.load(file)
     # Load the REC river network data containing geometry information
-    rec_network_data = gpd.read_file(existing_network_series["network_data_path"])
-    # Set the data type of the 'first_coord' and 'last_coord' columns to geometry
-    rec_network_data["first_coord"] = rec_network_data["first_coord"].apply(shapely.wkt.loads).astype("geometry")
-    rec_network_data["last_coord"] = rec_network_data["last_coord"].apply(shapely.wkt.loads).astype("geometry")
+    rec_network_data = read_network_data(existing_network_series["network_data_path"])
     # Replace NaN values with None in the 'node_intersect_aoi' column
     rec_network_data["node_intersect_aoi"] = rec_network_data["node_intersect_aoi"].replace(np.nan, None)
     # Log a message indicating the successful retrieval of REC river network and its associated data from the database
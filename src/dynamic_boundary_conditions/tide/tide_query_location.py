@@ -2,14 +2,24 @@
 """Get the locations used to fetch tide data from NIWA using the tide API."""
 
 import logging
+from typing import Optional
 
 import geopandas as gpd
-from shapely.geometry import LineString, Point
+import numpy as np
+import shapely
 from sqlalchemy.engine import Engine
 from sqlalchemy.sql import text
 
 log = logging.getLogger(__name__)
 
+# Common table expression splitting the bound catchment polygon into parts of at most 256 vertices, shared by the
+# queries selecting data near the catchment area. Large catchments then give tight bounding boxes, and joining the
+# parts (rather than testing them with EXISTS) lets each part probe the spatial index of the table being queried.
+CATCHMENT_PARTS_CTE = """
+    WITH parts AS (
+        SELECT ST_Subdivide(ST_GeomFromWKB(:catchment_polygon, 2193), 256) AS geometry
+    )"""
+
 
 class NoTideDataException(Exception):
     """Exception raised when no tide data is to be used for the BG-Flood model."""
@@ -34,27 +44,63 @@ def get_regional_council_clipped_from_db(
         A GeoDataFrame containing the regional council clipped data for the catchment area.
     """
     # Extract the catchment polygon from the GeoDataFrame
-    catchment_polygon = catchment_area["geometry"][0]
-    # Construct the query to retrieve the regional council clipped data
-    command_text = """
-    SELECT *
+    catchment_polygon = catchment_area["geometry"].iloc[0]
+    # Construct the query to retrieve the regional council clipped data, removing regions intersecting multiple parts
+    command_text = f"""{CATCHMENT_PARTS_CTE}
+    SELECT DISTINCT rgc.*
     FROM region_geometry_clipped AS rgc
-    WHERE ST_Intersects(rgc.geometry, ST_GeomFromText(:catchment_polygon, 2193));
+    JOIN parts ON ST_Intersects(rgc.geometry, parts.geometry);
     """
     query = text(command_text).bindparams(
-        catchment_polygon=str(catchment_polygon)
+        catchment_polygon=catchment_polygon.wkb
     )
     # Execute the query and retrieve the result as a GeoDataFrame
     regions_clipped = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
     return regions_clipped
 
 
-def get_nz_coastline_from_db(
+def check_catchment_covered_by_region(engine: Engine, catchment_area: gpd.GeoDataFrame) -> bool:
+    """
+    Check whether the catchment area is entirely covered by a single regional council clipped region.
+
+    Parameters
+    ----------
+    engine : Engine
+        The engine used to connect to the database.
+    catchment_area : gpd.GeoDataFrame
+        A GeoDataFrame representing the catchment area.
+
+    Returns
+    -------
+    bool
+        True if a single region covers the catchment area, False otherwise.
+    """
+    # Extract the catchment polygon from the GeoDataFrame
+    catchment_polygon = catchment_area["geometry"].iloc[0]
+    # Construct the query to check whether any region covers the catchment polygon, using the spatial index
+    command_text = """
+    SELECT EXISTS (
+        SELECT 1
+        FROM region_geometry_clipped AS rgc
+        WHERE ST_Covers(rgc.geometry, ST_GeomFromWKB(:catchment_polygon, 2193))
+    );
+    """
+    query = text(command_text).bindparams(
+        catchment_polygon=catchment_polygon.wkb
+    )
+    # Execute the query and retrieve the result
+    with engine.connect() as conn:
+        return conn.execute(query).scalar()
+
+
+def get_closest_boundary_position_to_coastline(
         engine: Engine,
         catchment_area: gpd.GeoDataFrame,
-        distance_km: int = 1) -> gpd.GeoDataFrame:
+        boundary_centroids: gpd.GeoDataFrame,
+        distance_km: int = 1) -> Optional[str]:
     """
-    Retrieve the New Zealand coastline data within a specified distance of the catchment area from the database.
+    Get the position of the catchment boundary line whose centroid is closest to the New Zealand coastline within a
+    specified distance of the catchment area.
 
     Parameters
     ----------
@@ -62,31 +108,49 @@ def get_nz_coastline_from_db(
         The engine used to connect to the database.
     catchment_area : gpd.GeoDataFrame
         A GeoDataFrame representing the catchment area.
+    boundary_centroids : gpd.GeoDataFrame
+        A GeoDataFrame containing the centroids of the boundary lines of the catchment area.
     distance_km : int = 1
-        Distance in kilometers used to buffer the catchment area for coastline retrieval. Default is 1 kilometer.
+        Distance in kilometers from the catchment area used for coastline retrieval. Default is 1 kilometer.
 
     Returns
     -------
-    gpd.GeoDataFrame
-        A GeoDataFrame containing the New Zealand coastline data within the specified distance of the catchment area.
-    """
+    Optional[str]
+        The position of the boundary line closest to the coastline, or None if no coastline is found within the
+        specified distance of the catchment area.
+    """  # noqa: D400
     # Convert distance from kilometers to meters
     distance_m = distance_km * 1000
-    # Buffer the catchment area to create a buffered polygon
-    catchment_area_buffered = catchment_area.buffer(distance=distance_m, join_style=2)
-    catchment_area_buffered_polygon = catchment_area_buffered.iloc[0]
-    # Construct the query to retrieve the New Zealand coastline data within the buffered catchment area
-    command_text = """
-    SELECT *
-    FROM nz_coastlines AS coast
-    WHERE ST_Intersects(coast.geometry, ST_GeomFromText(:catchment_area_buffered_polygon, 2193));
+    # Extract the catchment polygon from the GeoDataFrame
+    catchment_polygon = catchment_area["geometry"].iloc[0]
+    # Construct the query to find the boundary centroid closest to the New Zealand coastline within the specified
+    # distance of the catchment area, returning only its position rather than the coastline geometries.
+    # A coastline near multiple parts is repeated, which does not change the closest centroid.
+    command_text = f"""{CATCHMENT_PARTS_CTE},
+    nearby_coast AS (
+        SELECT coast.geometry
+        FROM nz_coastlines AS coast
+        JOIN parts ON ST_DWithin(coast.geometry, parts.geometry, :distance_m)
+    ),
+    centroids AS (
+        SELECT c.line_position, ST_GeomFromWKB(c.centroid, 2193) AS geometry
+        FROM unnest(CAST(:line_positions AS text[]), CAST(:centroids AS bytea[])) AS c(line_position, centroid)
+    )
+    SELECT centroids.line_position
+    FROM centroids
+    CROSS JOIN nearby_coast
+    ORDER BY centroids.geometry <-> nearby_coast.geometry
+    LIMIT 1;
     """
     query = text(command_text).bindparams(
-        catchment_area_buffered_polygon=str(catchment_area_buffered_polygon)
+        catchment_polygon=catchment_polygon.wkb,
+        distance_m=distance_m,
+        line_positions=boundary_centroids["line_position"].tolist(),
+        centroids=shapely.to_wkb(boundary_centroids["geometry"].to_numpy()).tolist()
     )
-    # Execute the query and retrieve the result as a GeoDataFrame
-    coastline = gpd.GeoDataFrame.from_postgis(query, engine, geom_col="geometry")
-    return coastline
+    # Execute the query and retrieve the position, if any coastline is found
+    with engine.connect() as conn:
+        return conn.execute(query).scalar()
 
 
 def get_catchment_boundary_info(catchment_area: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
@@ -108,35 +172,30 @@ def get_catchment_boundary_info(catchment_area: gpd.GeoDataFrame) -> gpd.GeoData
     ValueError
         If the position of a catchment boundary line cannot be identified.
     """
-    # Retrieve the coordinates of the exterior boundary of the catchment area
-    boundary_coords = catchment_area["geometry"].iloc[0].exterior.coords
-    # Create an empty list to store boundary segment properties
-    boundary_segments = []
-    # Loop through each boundary line segment
-    for i in range(len(boundary_coords) - 1):
-        # Get the start and end points of the current boundary segment
-        start_point, end_point = boundary_coords[i], boundary_coords[i + 1]
-        # Find the centroid of the current boundary segment
-        centroid = Point((start_point[0] + end_point[0]) / 2, (start_point[1] + end_point[1]) / 2)
-        # Determine the position of the centroid relative to the catchment area
-        if centroid.x == min(boundary_coords)[0]:
-            position = 'left'
-        elif centroid.x == max(boundary_coords)[0]:
-            position = 'right'
-        elif centroid.y == min(boundary_coords)[1]:
-            position = 'bot'
-        elif centroid.y == max(boundary_coords)[1]:
-            position = 'top'
-        else:
-            raise ValueError("Failed to identify catchment boundary line position.")
-        # Create a LineString object for the current boundary segment
-        boundary_geom = LineString([start_point, end_point])
-        # Add the boundary segment and its properties to the list
-        boundary_segments.append({'line_position': position, 'boundary': boundary_geom})
-    # Convert the list of boundary segments to a GeoDataFrame
-    boundary_info = gpd.GeoDataFrame(boundary_segments, geometry='boundary', crs=catchment_area.crs)
-    # Calculate and add the centroid of each boundary segment as a new column
-    boundary_info['centroid'] = boundary_info['boundary'].centroid
+    # Retrieve the catchment polygon and the coordinates of its exterior boundary as an array
+    catchment_polygon = catchment_area["geometry"].iloc[0]
+    boundary_coords = np.asarray(catchment_polygon.exterior.coords)[:, :2]
+    # Get the start and end points of each boundary line segment
+    start_points, end_points = boundary_coords[:-1], boundary_coords[1:]
+    # Find the centroid of each boundary line segment
+    centroids = (start_points + end_points) / 2
+    # Determine the position of each centroid relative to the catchment area
+    x_min, y_min, x_max, y_max = catchment_polygon.bounds
+    positions = np.select(
+        [centroids[:, 0] == x_min, centroids[:, 0] == x_max, centroids[:, 1] == y_min, centroids[:, 1] == y_max],
+        ['left', 'right', 'bot', 'top'],
+        default='')
+    if (positions == '').any():
+        raise ValueError("Failed to identify catchment boundary line position.")
+    # Create the boundary line segments and their centroids, with their positions, in a GeoDataFrame
+    boundary_info = gpd.GeoDataFrame(
+        {
+            'line_position': positions,
+            'boundary': shapely.linestrings(np.stack([start_points, end_points], axis=1)),
+            'centroid': gpd.GeoSeries(shapely.points(centroids), crs=catchment_area.crs),
+        },
+        geometry='boundary',
+        crs=catchment_area.crs)
     return boundary_info
 
 
@@ -212,10 +271,12 @@ def get_non_intersection_centroid_position(
     non_intersections['centroid'] = non_intersections.centroid
     # Get the boundary lines of the catchment area
     boundary_lines = get_catchment_boundary_lines(catchment_area)
+    # Calculate the distance from each non-intersection centroid point to each boundary line in a single batch
+    distances = shapely.distance(
+        non_intersections['centroid'].to_numpy()[:, np.newaxis],
+        boundary_lines['geometry'].to_numpy()[np.newaxis, :])
     # Identify the closest boundary line for each non-intersection centroid point
-    non_intersections['position'] = non_intersections['centroid'].apply(
-        lambda centroid: boundary_lines.loc[boundary_lines['geometry'].distance(centroid).idxmin(), 'line_position']
-    )
+    non_intersections['position'] = boundary_lines['line_position'].to_numpy()[distances.argmin(axis=1)]
     # Select the required columns and rename 'centroid' to 'geometry'
     non_intersections = non_intersections[['position', 'centroid']].rename(columns={'centroid': 'geometry'})
     # Set the 'geometry' column as the active geometry column
@@ -250,28 +311,29 @@ def get_tide_query_locations(
         If no coastline is found within the specified distance of the catchment area.
     """
     log.info("Identifying query locations used for fetching 'tide' data from NIWA.")
-    # Get the regional council clipped data for the catchment area
-    regions_clipped = get_regional_council_clipped_from_db(engine, catchment_area)
-    # Determine the non-intersection area
-    non_intersection_area = catchment_area.overlay(regions_clipped, how='difference')
+    # Skip the overlay if a single region covers the catchment area, as there is then no non-intersection area
+    if check_catchment_covered_by_region(engine, catchment_area):
+        non_intersection_area = catchment_area.iloc[0:0]
+    else:
+        # Get the regional council clipped data for the catchment area
+        regions_clipped = get_regional_council_clipped_from_db(engine, catchment_area)
+        # Determine the non-intersection area
+        non_intersection_area = catchment_area.overlay(regions_clipped, how='difference')
     # Check if there is no non-intersection area
     if non_intersection_area.empty:
-        # Get the New Zealand coastline data within the specified distance of the catchment area
-        coastline = get_nz_coastline_from_db(engine, catchment_area, distance_km)
-        # Check if coastline data is empty
-        if coastline.empty:
+        # Get the centroid positions of the catchment boundary lines
+        boundary_centroids = get_catchment_boundary_centroids(catchment_area)
+        # Find the position of the boundary centroid closest to the coastline within the specified distance
+        closest_position = get_closest_boundary_position_to_coastline(
+            engine, catchment_area, boundary_centroids, distance_km)
+        # Check if no coastline was found
+        if closest_position is None:
             # If no coastline is found, raise an exception
             raise NoTideDataException(
                 f"No query locations were found within {distance_km}km of the catchment area; "
                 f"hence, 'tide' data will not be utilised in the BG-Flood model.")
-        # Extract the geometry of the coastline
-        coastline_geom = coastline['geometry'].iloc[0]
-        # Get the centroid positions of the catchment boundary lines
-        boundary_centroids = get_catchment_boundary_centroids(catchment_area)
-        # Calculate the distance from each boundary centroid to the coastline
-        boundary_centroids['dist_to_coast'] = boundary_centroids.distance(coastline_geom)
         # Select the boundary centroid closest to the coastline
-        tide_query_location = boundary_centroids.sort_values('dist_to_coast').head(1)
+        tide_query_location = boundary_centroids[boundary_centroids['line_position'] == closest_position].head(1)
         # Rename the 'line_position' column to 'position' for consistency
         tide_query_location = tide_query_location[['line_position', 'geometry']].rename(
             columns={'line_position': 'position'})
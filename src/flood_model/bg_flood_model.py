@@ -8,12 +8,16 @@ import logging
 import os
 import pathlib
 import platform
+import re
 import subprocess
+from collections import Counter
 from datetime import datetime
-from typing import Tuple, Union, Optional, TextIO
+from typing import List, NamedTuple, Tuple, Union, Optional
 
 import geopandas as gpd
-import xarray as xr
+import netCDF4
+import pyproj
+import shapely
 from newzealidar.utils import get_dem_by_geometry
 from sqlalchemy import insert
 from sqlalchemy.engine import Engine
@@ -30,6 +34,15 @@ from src.flood_model.serve_model import add_model_output_to_geoserver
 
 log = logging.getLogger(__name__)
 
+# Query to retrieve the file path of a BG-Flood model output by its ID
+MODEL_OUTPUT_BY_ID_QUERY = text("SELECT file_path FROM bg_flood_model_output WHERE unique_id=:flood_model_id")
+# Pattern matching the names of river input files, equivalent to the glob 'river[0-9]*_*.txt'
+RIVER_INPUT_FILE_PATTERN = re.compile(r"river[0-9].*_.*\.txt")
+# Name of the grid mapping variable holding the CRS of the model output, matching the variable rioxarray writes
+GRID_MAPPING_VAR = "spatial_ref"
+# Spatial dimensions of the BG-Flood model output
+MODEL_OUTPUT_X_DIM, MODEL_OUTPUT_Y_DIM = "xx_P0", "yy_P0"
+
 Base = declarative_base()
 
 
@@ -100,7 +113,7 @@ def get_model_output_metadata(
     # Get the absolute path of the BG Flood model output file as a string
     output_path = model_output_path.as_posix()
     # Get the WKT representation of the catchment area's geometry
-    catchment_geom = catchment_area["geometry"].to_wkt().iloc[0]
+    catchment_geom = shapely.to_wkt(catchment_area["geometry"].iloc[0])
     # Return the metadata as a tuple
     return output_name, output_path, catchment_geom
 
@@ -111,6 +124,7 @@ def store_model_output_metadata_to_db(
         catchment_area: gpd.GeoDataFrame) -> int:
     """
     Store metadata related to the BG Flood model output in the database.
+    The 'bg_flood_model_output' table must already exist, see `main()`.
 
     Parameters
     ----------
@@ -125,9 +139,7 @@ def store_model_output_metadata_to_db(
     -------
     int
         Returns the model id of the new flood_model produced
-    """
-    # Create the 'bg_flood_model_output' table in the database if it doesn't exist
-    create_table(engine, BGFloodModelOutput)
+    """  # noqa: D400
     # Get the metadata related to the BG Flood model output
     output_name, output_path, geometry = get_model_output_metadata(model_output_path, catchment_area)
     # Create a new query object representing the BG-Flood model output metadata
@@ -162,19 +174,19 @@ def model_output_from_db_by_id(engine: Engine, model_id: int) -> pathlib.Path:
     FileNotFoundError
         Error raised if `bg_flood` table is not found or does not contain the `model_id`.
     """
-    # Execute a query to get the model output record based on the 'flood_model_id' column
-    query = text("SELECT * FROM bg_flood_model_output WHERE unique_id=:flood_model_id").bindparams(
-        flood_model_id=model_id)
+    # Execute a query to get the model output file path based on the 'flood_model_id' column
+    query = MODEL_OUTPUT_BY_ID_QUERY.bindparams(flood_model_id=model_id)
     # Check table exists before querying
     bg_flood_table = "bg_flood_model_output"
     if not check_table_exists(engine, bg_flood_table):
         raise FileNotFoundError(f"{bg_flood_table} table does not exist")
-    row = engine.execute(query).fetchone()
+    with engine.connect() as conn:
+        row = conn.execute(query).fetchone()
     # If the row is empty then we could not find the model output
     if row is None:
         raise FileNotFoundError(f"bg_flood_model_output table does not contain row with unique_id: {model_id}")
     # Extract the file path from the retrieved record
-    latest_output_path = pathlib.Path(row["file_path"])
+    latest_output_path = pathlib.Path(row.file_path)
     # Extract the file path from the retrieved record
     return latest_output_path
 
@@ -225,104 +237,196 @@ def add_crs_to_model_output(engine: Engine, flood_model_output_id: int) -> None:
     """
     # Get the path to the latest BG-Flood model output file from the database
     model_output_file = model_output_from_db_by_id(engine, flood_model_output_id)
-    # Create a temporary file path for saving modifications before replacing the current latest model output file
-    temp_file = model_output_file.with_name(f"{model_output_file.stem}_temp{model_output_file.suffix}")
-
-    # Open the latest model output file as a xarray dataset
-    with xr.open_dataset(model_output_file, decode_coords="all") as latest_output:
-        # Check if the dataset lacks a Coordinate Reference System (CRS)
-        if latest_output.rio.crs is None:
-            # Add the Coordinate Reference System (CRS) information to the dataset
-            latest_output.rio.write_crs("epsg:2193", inplace=True)
-            # Set the spatial dimensions explicitly for proper interpretation
-            latest_output.rio.set_spatial_dims(x_dim="xx_P0", y_dim="yy_P0", inplace=True)
-            # Reproject the dataset to the specified CRS
-            latest_output = latest_output.rio.reproject("epsg:2193")
-            # Save the modified dataset to the temporary file
-            latest_output.to_netcdf(temp_file)
-
-    # Check if both the original and temporary files exist
-    if model_output_file.exists() and temp_file.exists():
-        # Replace the original file with the modified temporary file
-        temp_file.replace(model_output_file)
+
+    # Open the latest model output file for appending, so only its metadata is rewritten rather than the whole grid
+    with netCDF4.Dataset(model_output_file, "a") as latest_output:
+        # Check if the dataset already has a Coordinate Reference System (CRS)
+        if GRID_MAPPING_VAR in latest_output.variables or any(
+                "grid_mapping" in variable.ncattrs() for variable in latest_output.variables.values()):
+            return
+        # Add the Coordinate Reference System (CRS) information to the dataset as a grid mapping variable
+        crs = pyproj.CRS.from_epsg(2193)
+        grid_mapping = latest_output.createVariable(GRID_MAPPING_VAR, "i4")
+        grid_mapping.setncatts(crs.to_cf())
+        grid_mapping.spatial_ref = crs.to_wkt()
+        # Mark the spatial dimensions explicitly for proper interpretation
+        for axis, dim in (("x", MODEL_OUTPUT_X_DIM), ("y", MODEL_OUTPUT_Y_DIM)):
+            if dim in latest_output.variables:
+                latest_output.variables[dim].setncatts(
+                    {"axis": axis.upper(), "standard_name": f"projection_{axis}_coordinate"})
+        # Link every gridded variable to the grid mapping variable
+        for variable in latest_output.variables.values():
+            if {MODEL_OUTPUT_X_DIM, MODEL_OUTPUT_Y_DIM}.issubset(variable.dimensions):
+                variable.grid_mapping = GRID_MAPPING_VAR
     log.debug(f"Added CRS info to {model_output_file}")
 
 
-def process_rain_input_files(bg_flood_dir: pathlib.Path, param_file: TextIO) -> None:
+class BGFloodInputFiles(NamedTuple):
     """
-    Process rain input files and write their parameter values to the BG-Flood parameter file.
+    Represents the model input files in the BG-Flood model directory.
+
+    Attributes
+    ----------
+    rain : List[pathlib.Path]
+        The rain input files, named 'rain_forcing.*'.
+    boundary : List[pathlib.Path]
+        The uniform boundary input files, named '*_bnd.txt'.
+    river : List[pathlib.Path]
+        The river input files, named 'river[0-9]*_*.txt'.
+    """
+
+    rain: List[pathlib.Path]
+    boundary: List[pathlib.Path]
+    river: List[pathlib.Path]
+
+
+def get_bg_flood_input_files(bg_flood_dir: pathlib.Path) -> BGFloodInputFiles:
+    """
+    List the rain, uniform boundary and river input files in the BG-Flood model directory in a single pass.
 
     Parameters
     ----------
     bg_flood_dir : pathlib.Path
-        The BG-Flood model directory containing the rain input files.
-    param_file : TextIO
-        The file object representing the parameter file where the parameter values will be written.
+        The BG-Flood model directory containing the model input files.
+
+    Returns
+    -------
+    BGFloodInputFiles
+        A named tuple containing the rain, uniform boundary and river input files.
+    """
+    input_files = BGFloodInputFiles(rain=[], boundary=[], river=[])
+    # Read the BG-Flood directory once, sorting each entry into the input files it matches
+    with os.scandir(bg_flood_dir) as entries:
+        for entry in entries:
+            file_path = pathlib.Path(entry.path)
+            if entry.name.startswith("rain_forcing."):
+                input_files.rain.append(file_path)
+            if entry.name.endswith("_bnd.txt"):
+                input_files.boundary.append(file_path)
+            if RIVER_INPUT_FILE_PATTERN.fullmatch(entry.name):
+                input_files.river.append(file_path)
+    return input_files
+
+
+def get_data_var_names(netcdf_file_path: pathlib.Path) -> List[str]:
     """
+    Get the names of the data variables in a netCDF file, i.e. the variables that are not dimension coordinates,
+    reading only the file header.
+
+    Parameters
+    ----------
+    netcdf_file_path : pathlib.Path
+        The file path of the netCDF file.
+
+    Returns
+    -------
+    List[str]
+        The names of the data variables in the netCDF file, in the order they are stored.
+    """  # noqa: D400
+    with netCDF4.Dataset(netcdf_file_path) as dataset:
+        return [var_name for var_name in dataset.variables if var_name not in dataset.dimensions]
+
+
+def process_rain_input_files(rain_input_files: List[pathlib.Path]) -> List[str]:
+    """
+    Process rain input files and get their parameter lines for the BG-Flood parameter file.
+
+    Parameters
+    ----------
+    rain_input_files : List[pathlib.Path]
+        The rain input files in the BG-Flood model directory.
+
+    Returns
+    -------
+    List[str]
+        The rain parameter lines for the BG-Flood parameter file.
+    """
+    param_lines = []
     # Loop through the rain input files in the BG-Flood directory
-    for rain_input_file_path in bg_flood_dir.glob('rain_forcing.*'):
+    for rain_input_file_path in rain_input_files:
         # Extract the file extension from the rain input file
         file_extension = rain_input_file_path.suffix[1:]
         # Get the name of the rain input file
         rain_file = rain_input_file_path.name
         # Check if the file extension is 'txt'
         if file_extension == "txt":
-            # Write the plain text rain parameter line to the BG-Flood parameter file
-            param_file.write(f"rain = {rain_file};\n")
+            # Add the plain text rain parameter line
+            param_lines.append(f"rain = {rain_file};")
         else:
-            # If the input file is in netCDF format, read it using xarray and get the name of the rain variable
-            with xr.open_dataset(rain_input_file_path) as input_file:
-                rain_var_name = list(input_file.data_vars)[0]
-            # Write the netCDF rain parameter line to the BG-Flood parameter file
-            param_file.write(f"rain = {rain_file}?{rain_var_name};\n")
+            # If the input file is in netCDF format, get the name of the rain variable
+            rain_var_name = get_data_var_names(rain_input_file_path)[0]
+            # Add the netCDF rain parameter line
+            param_lines.append(f"rain = {rain_file}?{rain_var_name};")
+    return param_lines
 
 
-def process_boundary_input_files(bg_flood_dir: pathlib.Path, param_file: TextIO) -> None:
+def process_boundary_input_files(boundary_input_files: List[pathlib.Path]) -> List[str]:
     """
-    Process uniform boundary input files and write their parameter values to the BG-Flood parameter file.
+    Process uniform boundary input files and get their parameter lines for the BG-Flood parameter file.
 
     Parameters
     ----------
-    bg_flood_dir : pathlib.Path
-        The BG-Flood model directory containing the uniform boundary input files.
-    param_file : TextIO
-        The file object representing the parameter file where the parameter values will be written.
+    boundary_input_files : List[pathlib.Path]
+        The uniform boundary input files in the BG-Flood model directory.
+
+    Returns
+    -------
+    List[str]
+        The uniform boundary parameter lines for the BG-Flood parameter file.
     """
+    param_lines = []
     # Loop through the boundary input files in the BG-Flood directory
-    for boundary_input_file_path in bg_flood_dir.glob('*_bnd.txt'):
+    for boundary_input_file_path in boundary_input_files:
         # Extract the boundary position from the file name
         boundary_position = boundary_input_file_path.stem.split('_')[0]
         # Get the name of the boundary input file
         boundary_file = boundary_input_file_path.name
-        # Write the boundary parameter line to the BG-Flood parameter file
-        param_file.write(f"{boundary_position} = {boundary_file},2;\n")
+        # Add the boundary parameter line
+        param_lines.append(f"{boundary_position} = {boundary_file},2;")
+    return param_lines
 
 
-def process_river_input_files(bg_flood_dir: pathlib.Path, param_file: TextIO) -> None:
+def process_river_input_files(river_input_files: List[pathlib.Path]) -> List[str]:
     """
-    Process river input files, rename them, and write their parameter values to the BG-Flood parameter file.
+    Process river input files, rename them, and get their parameter lines for the BG-Flood parameter file.
 
     Parameters
     ----------
-    bg_flood_dir : pathlib.Path
-        The BG-Flood model directory containing the river input files.
-    param_file : TextIO
-        The file object representing the parameter file where the parameter values will be written.
+    river_input_files : List[pathlib.Path]
+        The river input files in the BG-Flood model directory.
+
+    Returns
+    -------
+    List[str]
+        The river parameter lines for the BG-Flood parameter file.
+
+    Raises
+    ------
+    ValueError
+        If more than one river input file would be renamed to the same file name.
     """
+    # Split the file names into parts based on underscores
+    file_name_parts = [river_input_file_path.stem.split('_') for river_input_file_path in river_input_files]
+    # Create the new file names by combining the first part and the file extension
+    new_river_files = [
+        name_parts[0] + river_input_file_path.suffix
+        for name_parts, river_input_file_path in zip(file_name_parts, river_input_files)
+    ]
+    # Check that no two river input files would be renamed to the same file name, before renaming any of them
+    duplicated_files = sorted(name for name, count in Counter(new_river_files).items() if count > 1)
+    if duplicated_files:
+        raise ValueError(f"More than one river input file would be renamed to {', '.join(duplicated_files)}.")
+
+    param_lines = []
     # Loop through the river input files in the BG-Flood directory
-    for river_input_file_path in bg_flood_dir.glob('river[0-9]*_*.txt'):
-        # Split the file name into parts based on underscores
-        file_name_parts = river_input_file_path.stem.split('_')
-        # Create the new file name by combining the first part and the file extension
-        new_river_file = file_name_parts[0] + river_input_file_path.suffix
-        # Create the new file path with the new name
-        new_file_path = river_input_file_path.with_name(new_river_file)
+    for river_input_file_path, name_parts, new_river_file in zip(river_input_files, file_name_parts, new_river_files):
         # Rename the input file with the new name
-        river_input_file_path.rename(new_file_path)
+        os.replace(river_input_file_path, river_input_file_path.with_name(new_river_file))
         # Join the remaining parts of the file name with commas to form the extents parameter value
-        extents = ','.join(file_name_parts[1:])
-        # Write the river parameter line to the BG-Flood parameter file
-        param_file.write(f"river = {new_river_file},{extents};\n")
+        extents = ','.join(name_parts[1:])
+        # Add the river parameter line
+        param_lines.append(f"river = {new_river_file},{extents};")
+    return param_lines
 
 
 def prepare_bg_flood_model_inputs(
@@ -363,32 +467,37 @@ def prepare_bg_flood_model_inputs(
         Set the value to 1 to enable short integer conversion, or set it to 0 to save all variables as floats.
         Default value is 0.
     """
-    # Read the Hydro DEM file using xarray and get the name of the elevation variable
-    with xr.open_dataset(hydro_dem_path) as dem_file:
-        elev_var_name = list(dem_file.data_vars)[1]
-
-    # Construct the file path for the BG-Flood Model parameter file
+    # Get the name of the elevation variable in the Hydro DEM file
+    elev_var_name = get_data_var_names(hydro_dem_path)[1]
+
+    # General parameter values for the parameter file
+    param_lines = [
+        f"topo = {hydro_dem_path.as_posix()}?{elev_var_name};",
+        f"dx = {resolution};",
+        f"outputtimestep = {output_timestep};",
+        f"endtime = {end_time};",
+        f"mask = {mask};",
+        f"gpudevice = {gpu_device};",
+        f"smallnc = {small_nc};",
+        f"outfile = {model_output_path.as_posix()};",
+        "outvars = h, hmax, zb, zs, u, v;",
+    ]
+
+    # List the rain, uniform boundary and river input files in the BG-Flood directory
+    input_files = get_bg_flood_input_files(bg_flood_dir)
+    # Process rain input files and add their parameter values
+    param_lines += process_rain_input_files(input_files.rain)
+    # Process uniform boundary input files and add their parameter values
+    param_lines += process_boundary_input_files(input_files.boundary)
+    # Process river input files, rename them, and add their parameter values
+    param_lines += process_river_input_files(input_files.river)
+
+    # Write the BG-Flood Model parameter file to a temporary file and move it into place, so that the parameter file
+    # is never left partially written. The river input files have already been renamed at this point.
     bg_param_file_path = bg_flood_dir / "BG_param.txt"
-
-    # Open the BG-Flood Model parameter file for writing
-    with open(bg_param_file_path, "w+", encoding="utf-8") as param_file:
-        # Write general parameter values to the parameter file
-        param_file.write(f"topo = {hydro_dem_path.as_posix()}?{elev_var_name};\n"
-                         f"dx = {resolution};\n"
-                         f"outputtimestep = {output_timestep};\n"
-                         f"endtime = {end_time};\n"
-                         f"mask = {mask};\n"
-                         f"gpudevice = {gpu_device};\n"
-                         f"smallnc = {small_nc};\n"
-                         f"outfile = {model_output_path.as_posix()};\n"
-                         f"outvars = h, hmax, zb, zs, u, v;\n")
-
-        # Process rain input files and write their parameter values to the parameter file
-        process_rain_input_files(bg_flood_dir, param_file)
-        # Process uniform boundary input files and write their parameter values to the parameter file
-        process_boundary_input_files(bg_flood_dir, param_file)
-        # Process river input files, rename them, and write their parameter values to the parameter file
-        process_river_input_files(bg_flood_dir, param_file)
+    temp_param_file_path = bg_param_file_path.with_name(f"{bg_param_file_path.name}.tmp")
+    temp_param_file_path.write_text("\n".join(param_lines) + "\n", encoding="utf-8")
+    os.replace(temp_param_file_path, bg_param_file_path)
 
 
 def run_bg_flood_model(
@@ -527,6 +636,8 @@ def main(
     setup_logging(log_level)
     # Connect to the database
     engine = setup_environment.get_database()
+    # Create the 'bg_flood_model_output' table in the database if it doesn't exist, before running the model
+    create_table(engine, BGFloodModelOutput)
     # Get catchment area
     catchment_area = get_catchment_area(selected_polygon_gdf, to_crs=2193)
     # Get a new file path for saving the BG Flood model output with the current timestamp included in the filename
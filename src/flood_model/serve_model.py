@@ -39,7 +39,10 @@ def convert_nc_to_gtiff(nc_file_path: pathlib.Path) -> pathlib.Path:
     gtiff_filepath = temp_dir / new_name
     # Convert the max depths to geo tiff
     with xr.open_dataset(nc_file_path, decode_coords="all") as ds:
-        ds['hmax_P0'][0].rio.to_raster(gtiff_filepath)
+        max_depths = ds['hmax_P0'][0]
+        # Order the rows north to south, as BG-Flood writes them south to north, so the GeoTiff is north-up
+        max_depths = max_depths.sortby(max_depths.rio.y_dim, ascending=False)
+        max_depths.rio.to_raster(gtiff_filepath)
     return pathlib.Path(os.getcwd()) / gtiff_filepath
 
 
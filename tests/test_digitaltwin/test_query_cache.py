@@ -0,0 +1,57 @@
+import tempfile
+import unittest
+from unittest.mock import patch, MagicMock
+
+import geopandas as gpd
+import pandas as pd
+from shapely.geometry import box
+
+from src.digitaltwin import query_cache
+
+
+class QueryCacheTest(unittest.TestCase):
+    """Tests for query_cache.py."""
+
+    def setUp(self):
+        """Create a temporary cache directory and a mock query function."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.catchment_area = gpd.GeoDataFrame(geometry=[box(0, 0, 10, 10)], crs=2193)
+        self.query_result = gpd.GeoDataFrame({"site_id": ["a", "b"]}, geometry=[box(0, 0, 1, 1), box(1, 1, 2, 2)],
+                                             crs=2193)
+        self.mock_query = MagicMock(return_value=self.query_result, __name__="mock_query", __qualname__="mock_query")
+
+    def tearDown(self):
+        """Remove the temporary cache directory."""
+        self.temp_dir.cleanup()
+
+    def test_query_cache_disabled_always_queries(self):
+        """Test to ensure the query is run on every call when QUERY_CACHE_DIR is not set."""
+        with patch.object(query_cache.EnvVariable, "QUERY_CACHE_DIR", None):
+            cached_query = query_cache.query_cache(self.mock_query)
+            cached_query(self.catchment_area, ari=100)
+            cached_query(self.catchment_area, ari=100)
+        self.assertEqual(2, self.mock_query.call_count)
+
+    def test_query_cache_reuses_result_for_same_arguments(self):
+        """Test to ensure a repeated call with the same arguments is read from the cache instead of re-queried."""
+        with patch.object(query_cache.EnvVariable, "QUERY_CACHE_DIR", self.temp_dir.name):
+            cached_query = query_cache.query_cache(self.mock_query)
+            first_result = cached_query(self.catchment_area, ari=100)
+            second_result = cached_query(self.catchment_area, ari=100)
+        self.assertEqual(1, self.mock_query.call_count)
+        self.assertIsInstance(second_result, gpd.GeoDataFrame)
+        pd.testing.assert_frame_equal(pd.DataFrame(first_result), pd.DataFrame(second_result))
+        self.assertEqual(first_result.crs, second_result.crs)
+
+    def test_query_cache_different_arguments_query_again(self):
+        """Test to ensure calls with different arguments do not share a cached result."""
+        with patch.object(query_cache.EnvVariable, "QUERY_CACHE_DIR", self.temp_dir.name):
+            cached_query = query_cache.query_cache(self.mock_query)
+            cached_query(self.catchment_area, ari=100)
+            cached_query(self.catchment_area, ari=50)
+            cached_query(gpd.GeoDataFrame(geometry=[box(0, 0, 5, 5)], crs=2193), ari=100)
+        self.assertEqual(3, self.mock_query.call_count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+
+import geopandas as gpd
+from shapely.geometry import box, LineString, Point, Polygon
+
+from src.dynamic_boundary_conditions.tide import tide_query_location
+
+
+class TideQueryLocationTest(unittest.TestCase):
+    """Tests for tide_query_location.py."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Get all relevant data used for testing."""
+        cls.catchment_area = gpd.GeoDataFrame(geometry=[box(1570000, 5180000, 1575000, 5186000)], crs=2193)
+
+    def test_get_catchment_boundary_info_positions(self):
+        """Test to ensure each boundary segment of the catchment area is assigned its correct position."""
+        boundary_info = tide_query_location.get_catchment_boundary_info(self.catchment_area)
+        positions = dict(zip(boundary_info["line_position"], boundary_info["boundary"]))
+        self.assertEqual({"left", "right", "bot", "top"}, set(positions))
+        self.assertTrue(positions["left"].equals(LineString([(1570000, 5180000), (1570000, 5186000)])))
+        self.assertTrue(positions["top"].equals(LineString([(1570000, 5186000), (1575000, 5186000)])))
+
+    def test_get_catchment_boundary_info_centroids(self):
+        """Test to ensure the centroid of each boundary segment is the midpoint of the segment."""
+        boundary_info = tide_query_location.get_catchment_boundary_info(self.catchment_area)
+        self.assertTrue(boundary_info["centroid"].geom_equals(boundary_info["boundary"].centroid).all())
+        self.assertEqual(self.catchment_area.crs, boundary_info["centroid"].crs)
+        right_centroid = boundary_info.loc[boundary_info["line_position"] == "right", "centroid"].iloc[0]
+        self.assertTrue(right_centroid.equals(Point(1575000, 5183000)))
+
+    def test_get_catchment_boundary_info_non_rectangular_raises(self):
+        """Test to ensure a ValueError is raised when a boundary segment position cannot be identified."""
+        catchment_area = gpd.GeoDataFrame(geometry=[Polygon([(0, 0), (1, 3), (3, 1)])], crs=2193)
+        with self.assertRaises(ValueError):
+            tide_query_location.get_catchment_boundary_info(catchment_area)
+
+    def test_get_non_intersection_centroid_position_closest_boundary(self):
+        """Test to ensure each non-intersection area is assigned the position of its closest catchment boundary."""
+        non_intersection_area = gpd.GeoDataFrame(
+            geometry=[
+                box(1570000, 5182000, 1570500, 5182500),
+                box(1574000, 5185600, 1574200, 5185900),
+                box(1572000, 5180100, 1572400, 5180300),
+                box(1574700, 5181000, 1574900, 5181400),
+            ],
+            crs=2193)
+        non_intersections = tide_query_location.get_non_intersection_centroid_position(
+            self.catchment_area, non_intersection_area)
+        self.assertEqual(["left", "top", "bot", "right"], non_intersections["position"].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
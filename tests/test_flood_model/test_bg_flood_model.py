@@ -0,0 +1,117 @@
+import pathlib
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import netCDF4
+import numpy as np
+import rioxarray  # noqa: F401  # Registers the rio accessor on xarray objects
+import xarray as xr
+
+from src.flood_model import bg_flood_model
+
+
+class BGFloodInputFilesTest(unittest.TestCase):
+    """Tests for listing and processing the BG-Flood model input files in bg_flood_model.py."""
+
+    def setUp(self):
+        """Create a temporary BG-Flood model directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.bg_flood_dir = pathlib.Path(self.temp_dir.name)
+
+    def tearDown(self):
+        """Remove the temporary BG-Flood model directory."""
+        self.temp_dir.cleanup()
+
+    def create_files(self, *file_names: str) -> None:
+        """Create empty files with the given names in the temporary BG-Flood model directory."""
+        for file_name in file_names:
+            (self.bg_flood_dir / file_name).touch()
+
+    def test_get_bg_flood_input_files_sorts_files(self):
+        """Test to ensure the input files are sorted into rain, uniform boundary and river input files."""
+        self.create_files("rain_forcing.txt", "top_bnd.txt", "river1_1_2_3_4.txt", "BG_param.txt")
+        input_files = bg_flood_model.get_bg_flood_input_files(self.bg_flood_dir)
+        self.assertEqual(["rain_forcing.txt"], [file.name for file in input_files.rain])
+        self.assertEqual(["top_bnd.txt"], [file.name for file in input_files.boundary])
+        self.assertEqual(["river1_1_2_3_4.txt"], [file.name for file in input_files.river])
+
+    def test_river_input_file_pattern_ignores_non_matching_files(self):
+        """Test to ensure files that do not match the river input file naming are not treated as river inputs."""
+        self.create_files("river1.txt", "riverx_1_2.txt", "river1_1_2.csv", "river1_1_2.txt.bak", "ariver1_1_2.txt")
+        input_files = bg_flood_model.get_bg_flood_input_files(self.bg_flood_dir)
+        self.assertEqual([], input_files.river)
+
+    def test_process_river_input_files_renames_files(self):
+        """Test to ensure river input files are renamed and their parameter lines include their extents."""
+        self.create_files("river1_1_2_3_4.txt", "river2_5_6_7_8.txt")
+        river_input_files = sorted(bg_flood_model.get_bg_flood_input_files(self.bg_flood_dir).river)
+        param_lines = bg_flood_model.process_river_input_files(river_input_files)
+        self.assertEqual(["river = river1.txt,1,2,3,4;", "river = river2.txt,5,6,7,8;"], param_lines)
+        self.assertEqual(["river1.txt", "river2.txt"], sorted(file.name for file in self.bg_flood_dir.iterdir()))
+
+    def test_process_river_input_files_name_collision(self):
+        """Test to ensure a ValueError is raised, before renaming, when two river input files share a new name."""
+        self.create_files("river1_x_y.txt", "river1_a_b.txt")
+        river_input_files = bg_flood_model.get_bg_flood_input_files(self.bg_flood_dir).river
+        with self.assertRaises(ValueError):
+            bg_flood_model.process_river_input_files(river_input_files)
+        self.assertEqual(
+            ["river1_a_b.txt", "river1_x_y.txt"], sorted(file.name for file in self.bg_flood_dir.iterdir()))
+
+
+class AddCrsToModelOutputTest(unittest.TestCase):
+    """Tests for adding a CRS to the BG-Flood model output in bg_flood_model.py."""
+
+    def setUp(self):
+        """Write a small BG-Flood style model output, without a CRS, to a temporary directory."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.model_output_file = pathlib.Path(self.temp_dir.name) / "output.nc"
+        x_dim, y_dim = bg_flood_model.MODEL_OUTPUT_X_DIM, bg_flood_model.MODEL_OUTPUT_Y_DIM
+        model_output = xr.Dataset(
+            {
+                "hmax_P0": (("time", y_dim, x_dim), np.zeros((2, 3, 4), dtype="float32")),
+                "zb_P0": ((y_dim, x_dim), np.zeros((3, 4), dtype="float32")),
+            },
+            coords={
+                x_dim: 1_500_000 + 10 * np.arange(4.0),
+                y_dim: 5_100_000 + 10 * np.arange(3.0),
+                "time": [0.0, 100.0],
+            })
+        model_output.to_netcdf(self.model_output_file)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        self.temp_dir.cleanup()
+
+    def add_crs_to_model_output(self) -> None:
+        """Run add_crs_to_model_output on the temporary model output rather than one found in the database."""
+        with patch.object(bg_flood_model, "model_output_from_db_by_id", return_value=self.model_output_file):
+            bg_flood_model.add_crs_to_model_output(engine=None, flood_model_output_id=1)
+
+    def test_get_data_var_names(self):
+        """Test to ensure only the data variables, not the dimension coordinates, are returned in file order."""
+        self.assertEqual(["hmax_P0", "zb_P0"], bg_flood_model.get_data_var_names(self.model_output_file))
+
+    def test_add_crs_to_model_output_attributes(self):
+        """Test to ensure the grid mapping variable is written and linked from each data variable."""
+        self.add_crs_to_model_output()
+        with netCDF4.Dataset(self.model_output_file) as model_output:
+            grid_mapping = model_output.variables[bg_flood_model.GRID_MAPPING_VAR]
+            self.assertIn("NZGD2000", grid_mapping.crs_wkt)
+            self.assertEqual(grid_mapping.crs_wkt, grid_mapping.spatial_ref)
+            for var_name in ("hmax_P0", "zb_P0"):
+                self.assertEqual(bg_flood_model.GRID_MAPPING_VAR, model_output.variables[var_name].grid_mapping)
+
+    def test_add_crs_to_model_output_readable_by_rioxarray(self):
+        """Test to ensure the model output opens with rioxarray in EPSG:2193, also when the CRS is added twice."""
+        self.add_crs_to_model_output()
+        self.add_crs_to_model_output()
+        with xr.open_dataset(self.model_output_file, decode_coords="all") as model_output:
+            self.assertEqual(2193, model_output["hmax_P0"].rio.crs.to_epsg())
+            self.assertEqual(bg_flood_model.MODEL_OUTPUT_X_DIM, model_output["hmax_P0"].rio.x_dim)
+            self.assertEqual(bg_flood_model.MODEL_OUTPUT_Y_DIM, model_output["hmax_P0"].rio.y_dim)
+
+
+if __name__ == '__main__':
+    unittest.main()